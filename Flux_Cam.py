@@ -4,20 +4,203 @@ Real-time camera preview with v4l2 controls and OpenCV effects
 """
 
 import sys
+import os
+import threading
 import subprocess
 import re
-import cv2
-import numpy as np
+import ctypes
+import fcntl
+import glob
+from concurrent.futures import ThreadPoolExecutor, wait
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QSlider, QLabel, QComboBox, QPushButton,
-                              QScrollArea)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
+                              QScrollArea, QSplashScreen)
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter, QColor, QPixmap
+from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+
+
+# OpenCV, NumPy and the Numba kernels take a while to load, so main() imports
+# them in the background with load_heavy_modules() while a splash is shown
+cv2 = None
+np = None
+kernels = None
+
+
+def load_heavy_modules():
+    """Import OpenCV, NumPy and the Numba kernels into this module"""
+    global cv2, np, kernels
+    import cv2
+    import numpy as np
+    import flux_kernels as kernels
+    kernels.warmup()
+
+
+# V4L2 ioctl ABI, see linux/videodev2.h
+class v4l2_capability(ctypes.Structure):
+    _fields_ = [('driver', ctypes.c_char * 16),
+                ('card', ctypes.c_char * 32),
+                ('bus_info', ctypes.c_char * 32),
+                ('version', ctypes.c_uint32),
+                ('capabilities', ctypes.c_uint32),
+                ('device_caps', ctypes.c_uint32),
+                ('reserved', ctypes.c_uint32 * 3)]
+
+
+class v4l2_control(ctypes.Structure):
+    _fields_ = [('id', ctypes.c_uint32),
+                ('value', ctypes.c_int32)]
+
+
+class v4l2_queryctrl(ctypes.Structure):
+    _fields_ = [('id', ctypes.c_uint32),
+                ('type', ctypes.c_uint32),
+                ('name', ctypes.c_char * 32),
+                ('minimum', ctypes.c_int32),
+                ('maximum', ctypes.c_int32),
+                ('step', ctypes.c_int32),
+                ('default_value', ctypes.c_int32),
+                ('flags', ctypes.c_uint32),
+                ('reserved', ctypes.c_uint32 * 2)]
+
+
+def _IOR(nr, struct):
+    return (2 << 30) | (ctypes.sizeof(struct) << 16) | (ord('V') << 8) | nr
+
+
+def _IOWR(nr, struct):
+    return (3 << 30) | (ctypes.sizeof(struct) << 16) | (ord('V') << 8) | nr
+
+
+VIDIOC_QUERYCAP = _IOR(0, v4l2_capability)
+VIDIOC_G_CTRL = _IOWR(27, v4l2_control)
+VIDIOC_S_CTRL = _IOWR(28, v4l2_control)
+VIDIOC_QUERYCTRL = _IOWR(36, v4l2_queryctrl)
+
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_VIDEO_CAPTURE_MPLANE = 0x00001000
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+V4L2_CTRL_TYPE_INTEGER = 1
+V4L2_CTRL_TYPE_BOOLEAN = 2
+V4L2_CTRL_FLAG_DISABLED = 0x0001
+V4L2_CTRL_FLAG_INACTIVE = 0x0010
+V4L2_CTRL_FLAG_HAS_PAYLOAD = 0x0100
+V4L2_CTRL_FLAG_NEXT_CTRL = 0x80000000
+
+
+# Fallback parsers for `v4l2-ctl --list-ctrls` when the device can't be opened
+CTRL_INT_RE = re.compile(r'\s*(\w+)\s+0x\w+\s+\((\w+)\)\s*:\s*min=(-?\d+)\s+max=(-?\d+).*default=(-?\d+)\s+value=(-?\d+)')
+CTRL_BOOL_RE = re.compile(r'\s*(\w+)\s+0x\w+\s+\(bool\)\s*:\s*default=(\d+)\s+value=(\d+)')
+
+
+def can_capture(device):
+    """Check via VIDIOC_QUERYCAP whether a video node captures frames"""
+    try:
+        fd = os.open(device, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return False
+    cap = v4l2_capability()
+    try:
+        fcntl.ioctl(fd, VIDIOC_QUERYCAP, cap)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    # Multi-function drivers expose per-node caps separately
+    caps = cap.device_caps if cap.capabilities & V4L2_CAP_DEVICE_CAPS else cap.capabilities
+    return bool(caps & (V4L2_CAP_VIDEO_CAPTURE | V4L2_CAP_VIDEO_CAPTURE_MPLANE))
+
+
+def query_controls(fd):
+    """Enumerate int and bool controls as (name, id, min, max, value, default)"""
+    controls = []
+    query = v4l2_queryctrl(id=V4L2_CTRL_FLAG_NEXT_CTRL)
+    while True:
+        try:
+            fcntl.ioctl(fd, VIDIOC_QUERYCTRL, query)
+        except OSError:
+            break
+        cid = query.id
+        query.id = cid | V4L2_CTRL_FLAG_NEXT_CTRL
+        
+        if query.flags & (V4L2_CTRL_FLAG_DISABLED | V4L2_CTRL_FLAG_INACTIVE):
+            continue
+        if query.type == V4L2_CTRL_TYPE_INTEGER and not query.flags & V4L2_CTRL_FLAG_HAS_PAYLOAD:
+            min_val, max_val = query.minimum, query.maximum
+        elif query.type == V4L2_CTRL_TYPE_BOOLEAN:
+            min_val, max_val = 0, 1
+        else:
+            continue
+        
+        # Same naming as v4l2-ctl: "White Balance, Auto" -> white_balance_auto
+        name = re.sub(r'[^a-z0-9]+', '_', query.name.decode(errors='replace').lower()).strip('_')
+        control = v4l2_control(id=cid)
+        try:
+            fcntl.ioctl(fd, VIDIOC_G_CTRL, control)
+            value = control.value
+        except OSError:
+            value = query.default_value
+        controls.append((name, cid, min_val, max_val, value, query.default_value))
+    return controls
+
+
+# Frames in flight between the capture thread and the GUI
+RING_SIZE = 3
+
+# Multi-pass OpenCV-only effects worth a per-frame UMat upload and download.
+# Single-pass ones (negative, grayscale) are cheaper on the host buffers.
+OPENCL_EFFECTS = {'blur', 'edge'}
+
+
+def cuda_device_count():
+    """Number of CUDA devices OpenCV can use (0 for non-CUDA builds)"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount()
+    except (AttributeError, cv2.error):
+        return 0
+
+
+def _transverse(src, dst):
+    """Transpose across the anti-diagonal (no single OpenCV call for this)"""
+    cv2.transpose(src, dst)
+    cv2.flip(dst, -1, dst)
+
+
+def pack_transform(mirror, flip, rotate):
+    """Pack transform state as bit0=mirror, bit1=flip, bits2-3=rotate/90"""
+    return int(mirror) | int(flip) << 1 | (rotate // 90) << 2
+
+
+# (mirror, flip, rotate) -> (transform, swaps_axes). Each entry is one call
+# equivalent to mirroring, then flipping, then rotating, writing into dst.
+_TRANSFORMS_BY_STATE = {
+    (False, False, 0): (None, False),
+    (False, False, 90): (lambda src, dst: cv2.rotate(src, cv2.ROTATE_90_CLOCKWISE, dst), True),
+    (False, False, 180): (lambda src, dst: cv2.flip(src, -1, dst), False),
+    (False, False, 270): (lambda src, dst: cv2.rotate(src, cv2.ROTATE_90_COUNTERCLOCKWISE, dst), True),
+    (False, True, 0): (lambda src, dst: cv2.flip(src, 0, dst), False),
+    (False, True, 90): (lambda src, dst: cv2.transpose(src, dst), True),
+    (False, True, 180): (lambda src, dst: cv2.flip(src, 1, dst), False),
+    (False, True, 270): (_transverse, True),
+    (True, False, 0): (lambda src, dst: cv2.flip(src, 1, dst), False),
+    (True, False, 90): (_transverse, True),
+    (True, False, 180): (lambda src, dst: cv2.flip(src, 0, dst), False),
+    (True, False, 270): (lambda src, dst: cv2.transpose(src, dst), True),
+    (True, True, 0): (lambda src, dst: cv2.flip(src, -1, dst), False),
+    (True, True, 90): (lambda src, dst: cv2.rotate(src, cv2.ROTATE_90_COUNTERCLOCKWISE, dst), True),
+    (True, True, 180): (None, False),
+    (True, True, 270): (lambda src, dst: cv2.rotate(src, cv2.ROTATE_90_CLOCKWISE, dst), True),
+}
+
+# The same table indexed directly by pack_transform()
+TRANSFORMS = [_TRANSFORMS_BY_STATE[(bool(i & 1), bool(i & 2), (i >> 2) * 90)] for i in range(16)]
 
 
 class VideoThread(QThread):
     """Thread for capturing and processing video frames"""
-    change_pixmap = pyqtSignal(QImage)
+    # The QImage wraps the ndarray without copying, so the array travels with it
+    change_pixmap = pyqtSignal(QImage, object)
     
     def __init__(self):
         super().__init__()
@@ -28,6 +211,39 @@ class VideoThread(QThread):
         self.rotate = 0  # 0, 90, 180, 270
         self.effect = 'none'
         
+        # Packed copy of mirror/flip/rotate, read once per frame
+        self._xform_flags = 0
+        self._xform_lock = threading.Lock()
+        self.buf_idx = 0
+        self._scratch = {}
+        self._frame_no = 0
+        
+        # Set by the GUI once the last emitted frame is on screen
+        self._gui_idle = threading.Event()
+        self._gui_idle.set()
+        
+        # Keep OpenCV-only effect chains on the GPU when OpenCL is available
+        self.use_opencl = cv2.ocl.useOpenCL()
+        
+        # Canny is the heaviest stage of the edge effect; run it on CUDA if we can
+        self.use_cuda = cuda_device_count() > 0
+        if self.use_cuda:
+            self._stream = cv2.cuda.Stream()
+            self._gpu_in = cv2.cuda_GpuMat()
+            self._gpu_gray = cv2.cuda_GpuMat()
+            self._gpu_edges = cv2.cuda_GpuMat()
+            self._gpu_out = cv2.cuda_GpuMat()
+            self._canny = cv2.cuda.createCannyEdgeDetector(100, 200)
+        
+        # 1D Gaussian for the separable blur, computed once instead of per call
+        self._gk = cv2.getGaussianKernel(15, 0)
+        
+    def set_transform(self, mirror, flip, rotate):
+        """Set mirror, flip and rotation together"""
+        with self._xform_lock:
+            self.mirror, self.flip, self.rotate = mirror, flip, rotate
+            self._xform_flags = pack_transform(mirror, flip, rotate)
+        
     def set_device(self, device):
         """Set video device"""
         device_num = int(device.replace('/dev/video', ''))
@@ -44,83 +260,154 @@ class VideoThread(QThread):
             return
             
         self.running = True
+        self._gui_idle.set()
+        
+        # Ring of capture buffers owned by the thread: OpenCV decodes straight
+        # into one slot while the GUI thread may still be painting older ones
+        self._bufs = [None] * RING_SIZE
+        self.buf_idx = 0
         
         while self.running:
-            ret, frame = cap.read()
-            if not ret:
+            # Drop frames while the GUI is still painting, and run the heavy
+            # cartoon effect at half rate. grab() drains the driver queue
+            # without decoding and without touching the ring, so a slot is
+            # only overwritten once the GUI has moved past it.
+            if not self._gui_idle.is_set():
+                cap.grab()
+                continue
+            # Read the effect once so every branch below agrees on it, even
+            # if the GUI changes it mid-frame
+            effect = self.effect
+            self._frame_no += 1
+            if effect == 'cartoon' and self._frame_no % 2:
+                cap.grab()
                 continue
                 
-            # Apply transformations
-            if self.mirror:
-                frame = cv2.flip(frame, 1)
-            if self.flip:
-                frame = cv2.flip(frame, 0)
-                
-            # Apply rotation
-            if self.rotate == 90:
-                frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-            elif self.rotate == 180:
-                frame = cv2.rotate(frame, cv2.ROTATE_180)
-            elif self.rotate == 270:
-                frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+            self.buf_idx = (self.buf_idx + 1) % RING_SIZE
+            ret, frame = cap.read(self._bufs[self.buf_idx])
+            if not ret:
+                continue
+            self._bufs[self.buf_idx] = frame
+            
+            # Apply mirror, flip and rotation in a single pass
+            transform, swaps_axes = TRANSFORMS[self._xform_flags]
+            if transform is not None:
+                h, w = frame.shape[:2]
+                shape = (w, h, 3) if swaps_axes else (h, w, 3)
+                dst = self._buffer('transform', shape, per_slot=True)
+                transform(frame, dst)
+                frame = dst
             
             # Apply effects
-            frame = self.apply_effect(frame)
+            frame = self.apply_effect(frame, effect)
             
-            # Convert to QImage
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            self.change_pixmap.emit(qt_image.copy())
+            # Wrap the BGR frame without copying; the receiver keeps the array
+            # alive for as long as it holds the image
+            h, w = frame.shape[:2]
+            qt_image = QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_BGR888)
+            self._gui_idle.clear()
+            self.change_pixmap.emit(qt_image, frame)
             
         cap.release()
         
-    def apply_effect(self, frame):
-        """Apply selected effect to frame"""
-        if self.effect == 'none':
+    def frame_presented(self):
+        """Called by the GUI thread when it is ready for the next frame"""
+        self._gui_idle.set()
+        
+    def _buffer(self, name, shape, like=None, dtype='uint8', per_slot=False):
+        """Return a persistent scratch array
+        
+        Frames handed to the GUI need per_slot=True so each ring slot gets its
+        own array; intermediates are shared. Passing a UMat as like returns a
+        persistent 8-bit device buffer instead.
+        """
+        on_device = isinstance(like, cv2.UMat)
+        slot = self.buf_idx if per_slot and not on_device else None
+        key = (name, slot, on_device)
+        entry = self._scratch.get(key)
+        if entry is None or entry[1] != shape:
+            if on_device:
+                channels = shape[2] if len(shape) == 3 else 1
+                buf = cv2.UMat(shape[0], shape[1], cv2.CV_8UC(channels))
+            else:
+                buf = np.empty(shape, dtype)
+            entry = self._scratch[key] = (buf, shape)
+        return entry[0]
+        
+    def apply_effect(self, frame, effect):
+        """Apply the given effect to frame"""
+        if self.use_cuda and effect == 'edge':
+            return self._edge_cuda(frame)
+        if self.use_opencl and effect in OPENCL_EFFECTS:
+            # Upload once; every intermediate stays on the device until get().
+            # The bindings can't download into an existing array, so get()
+            # allocates the output frame each time on this path.
+            return self._apply_effect(cv2.UMat(frame), frame.shape, effect).get()
+        return self._apply_effect(frame, frame.shape, effect)
+        
+    def _edge_cuda(self, frame):
+        """Edge effect on the GPU, queued on a single CUDA stream"""
+        self._gpu_in.upload(frame, self._stream)
+        cv2.cuda.cvtColor(self._gpu_in, cv2.COLOR_BGR2GRAY, self._gpu_gray, stream=self._stream)
+        self._canny.detect(self._gpu_gray, self._gpu_edges, stream=self._stream)
+        cv2.cuda.cvtColor(self._gpu_edges, cv2.COLOR_GRAY2BGR, self._gpu_out, stream=self._stream)
+        dst = self._buffer('effect', frame.shape, per_slot=True)
+        self._gpu_out.download(self._stream, dst)
+        self._stream.waitForCompletion()
+        return dst
+        
+    def _apply_effect(self, frame, shape, effect):
+        """Run the effect chain on an ndarray or UMat of the given shape"""
+        if effect == 'none':
             return frame
             
-        elif self.effect == 'blur':
-            return cv2.GaussianBlur(frame, (15, 15), 0)
+        elif effect == 'blur':
+            dst = self._buffer('effect', shape, like=frame, per_slot=True)
+            return cv2.sepFilter2D(frame, -1, self._gk, self._gk, dst=dst)
             
-        elif self.effect == 'edge':
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 100, 200)
-            return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+        elif effect == 'edge':
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._buffer('gray', shape[:2], like=frame))
+            edges = cv2.Canny(gray, 100, 200, edges=self._buffer('edges', shape[:2], like=frame))
+            return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR, dst=self._buffer('effect', shape, like=frame, per_slot=True))
             
-        elif self.effect == 'cartoon':
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.medianBlur(gray, 5)
-            edges = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, 
-                                         cv2.THRESH_BINARY, 9, 9)
-            color = cv2.bilateralFilter(frame, 9, 300, 300)
-            return cv2.bitwise_and(color, color, mask=edges)
+        elif effect == 'cartoon':
+            # Bilateral dominates the cost and scales with pixel count, so run
+            # the whole effect at half resolution and scale the result back up
+            h, w = shape[:2]
+            half = ((h + 1) // 2, (w + 1) // 2)
+            small = cv2.pyrDown(frame, dst=self._buffer('cartoon_small', half + (3,)))
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._buffer('cartoon_gray', half))
+            gray = cv2.medianBlur(gray, 5, dst=self._buffer('cartoon_median', half))
+            # The integral image is kept for the 9x9 threshold means
+            ii = cv2.integral(gray, sum=self._buffer('cartoon_ii', (half[0] + 1, half[1] + 1), dtype=np.int32),
+                              sdepth=cv2.CV_32S)
+            color = cv2.bilateralFilter(small, 5, 150, 150,
+                                        dst=self._buffer('cartoon_color', half + (3,)))
+            masked = self._buffer('cartoon_masked', half + (3,))
+            kernels.cartoon_u8(color, gray, ii, 9, 9, masked)
+            return cv2.pyrUp(masked, dstsize=(w, h), dst=self._buffer('effect', shape, per_slot=True))
             
-        elif self.effect == 'sepia':
-            kernel = np.array([[0.272, 0.534, 0.131],
-                              [0.349, 0.686, 0.168],
-                              [0.393, 0.769, 0.189]])
-            return cv2.transform(frame, kernel)
+        elif effect == 'sepia':
+            dst = self._buffer('effect', shape, per_slot=True)
+            kernels.sepia_u8(frame, dst)
+            return dst
             
-        elif self.effect == 'negative':
-            return cv2.bitwise_not(frame)
+        elif effect == 'negative':
+            return cv2.bitwise_not(frame, dst=self._buffer('effect', shape, like=frame, per_slot=True))
             
-        elif self.effect == 'grayscale':
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        elif effect == 'grayscale':
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._buffer('gray', shape[:2], like=frame))
+            return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=self._buffer('effect', shape, like=frame, per_slot=True))
             
-        elif self.effect == 'emboss':
-            kernel = np.array([[0, -1, -1],
-                              [1, 0, -1],
-                              [1, 1, 0]])
-            return cv2.filter2D(frame, -1, kernel) + 128
+        elif effect == 'emboss':
+            dst = self._buffer('effect', shape, per_slot=True)
+            kernels.emboss_u8(frame, dst)
+            return dst
             
-        elif self.effect == 'sharpen':
-            kernel = np.array([[0, -1, 0],
-                              [-1, 5, -1],
-                              [0, -1, 0]])
-            return cv2.filter2D(frame, -1, kernel)
+        elif effect == 'sharpen':
+            dst = self._buffer('effect', shape, per_slot=True)
+            kernels.sharpen_u8(frame, dst)
+            return dst
             
         return frame
         
@@ -130,11 +417,77 @@ class VideoThread(QThread):
         self.wait()
 
 
+class _FrameView:
+    """Frame handling shared by the OpenGL and raster preview widgets"""
+    
+    def _init_frame(self):
+        self._image = None
+        self._array = None
+        self._shown = True
+        
+    def upload(self, image, array):
+        """Queue a frame for the next repaint
+        
+        image wraps array's memory, so the array is held alongside it.
+        """
+        self._image = image
+        self._array = array
+        self._shown = False
+        self.update()
+        
+    def _paint_frame(self):
+        """Draw the latest frame stretched over the widget"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor('#252525'))
+        if self._image is not None:
+            painter.drawImage(self.rect(), self._image)
+        painter.end()
+        
+        # The new frame is on screen, so the thread may produce the next one.
+        # The image is kept (with its array) for later resize/expose redraws.
+        if not self._shown:
+            self._shown = True
+            self.frame_shown.emit()
+
+
+class VideoWidget(QOpenGLWidget, _FrameView):
+    """Video preview drawn through Qt's OpenGL paint engine so scaling runs on the GPU"""
+    frame_shown = pyqtSignal()
+    
+    def __init__(self):
+        super().__init__()
+        self._init_frame()
+        
+    def paintGL(self):
+        self._paint_frame()
+
+
+class RasterVideoWidget(QWidget, _FrameView):
+    """Video preview painted on the CPU, for platforms without OpenGL"""
+    frame_shown = pyqtSignal()
+    
+    def __init__(self):
+        super().__init__()
+        self._init_frame()
+        
+    def paintEvent(self, event):
+        self._paint_frame()
+
+
 class WebcamController(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_device = None
         self.controls = {}
+        self._fd = None
+        self._control_ids = {}
+        self._pending_controls = {}
+        
+        # Flushes pending slider values at most once per 16 ms (~60 Hz)
+        self._control_timer = QTimer(self)
+        self._control_timer.setSingleShot(True)
+        self._control_timer.setInterval(16)
+        self._control_timer.timeout.connect(self.flush_controls)
         self.video_thread = VideoThread()
         self.video_thread.change_pixmap.connect(self.update_frame)
         self.init_ui()
@@ -372,14 +725,9 @@ class WebcamController(QMainWindow):
         video_layout = QVBoxLayout(video_container)
         video_layout.setContentsMargins(20, 20, 20, 20)
         
-        self.video_label = QLabel()
-        self.video_label.setStyleSheet("""
-            background-color: #252525;
-            border-radius: 10px;
-        """)
-        self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.video_label.setScaledContents(True)
-        video_layout.addWidget(self.video_label)
+        self.video_widget = VideoWidget()
+        self.video_widget.frame_shown.connect(self.video_thread.frame_presented)
+        video_layout.addWidget(self.video_widget)
         
         # Add to main layout
         main_layout.addWidget(control_panel)
@@ -388,16 +736,10 @@ class WebcamController(QMainWindow):
     def detect_cameras(self):
         """Detect available cameras with capture capability"""
         try:
-            result = subprocess.run(
-                ['bash', '-c', 
-                 'for device in /dev/video*; do udevadm info "$device" 2>/dev/null | '
-                 '{ grep -q "CAPABILITIES=.*:capture:" && echo "$device" ;}; done'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            devices = [d.strip() for d in result.stdout.split('\n') if d.strip()]
+            nodes = glob.glob('/sys/class/video4linux/video*')
+            nodes.sort(key=lambda path: int(path.rsplit('video', 1)[1]))
+            devices = [f"/dev/{os.path.basename(node)}" for node in nodes]
+            devices = [device for device in devices if can_capture(device)]
             
             if devices:
                 for device in devices:
@@ -413,18 +755,11 @@ class WebcamController(QMainWindow):
     def get_device_name(self, device):
         """Get friendly name for video device"""
         try:
-            result = subprocess.run(
-                ['v4l2-ctl', '-d', device, '--info'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            for line in result.stdout.split('\n'):
-                if 'Card type' in line:
-                    return line.split(':', 1)[1].strip()
-        except:
-            pass
-        return "Unknown"
+            node = os.path.basename(device)
+            with open(f'/sys/class/video4linux/{node}/name') as f:
+                return f.read().strip()
+        except OSError:
+            return "Unknown"
     
     def change_camera(self, selection):
         """Change active camera"""
@@ -433,9 +768,27 @@ class WebcamController(QMainWindow):
             return
             
         self.current_device = device
+        self.open_device()
         self.load_controls()
         self.start_camera()
     
+    def open_device(self):
+        """Open the current device for control ioctls, closing the previous one"""
+        self.close_device()
+        try:
+            self._fd = os.open(self.current_device, os.O_RDWR | os.O_NONBLOCK)
+        except OSError as e:
+            print(f"Error opening {self.current_device}, falling back to v4l2-ctl: {e}")
+    
+    def close_device(self):
+        """Close the control file descriptor, if any"""
+        self._control_timer.stop()
+        self._pending_controls.clear()
+        self._control_ids.clear()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
     def start_camera(self):
         """Start camera preview with OpenCV"""
         if self.video_thread.running:
@@ -444,9 +797,31 @@ class WebcamController(QMainWindow):
         self.video_thread.set_device(self.current_device)
         self.video_thread.start()
     
-    def update_frame(self, image):
-        """Update video frame in label"""
-        self.video_label.setPixmap(QPixmap.fromImage(image))
+    def update_frame(self, image, array):
+        """Update video frame in the preview"""
+        self.video_widget.upload(image, array)
+    
+    def showEvent(self, event):
+        """Check the GL preview once Qt has tried to create its context"""
+        super().showEvent(event)
+        QTimer.singleShot(0, self.check_video_widget)
+    
+    def check_video_widget(self):
+        """Swap in a raster preview if the OpenGL one has no context"""
+        old = self.video_widget
+        if not isinstance(old, VideoWidget) or old.isValid():
+            return
+        print("OpenGL preview unavailable, falling back to raster painting")
+        
+        fallback = RasterVideoWidget()
+        fallback.frame_shown.connect(self.video_thread.frame_presented)
+        old.parentWidget().layout().replaceWidget(old, fallback)
+        old.deleteLater()
+        self.video_widget = fallback
+        
+        # Carry over a frame the GL widget never painted, or capture stays gated
+        if not old._shown:
+            fallback.upload(old._image, old._array)
     
     def change_effect(self, effect_name):
         """Change video effect"""
@@ -465,15 +840,18 @@ class WebcamController(QMainWindow):
     
     def toggle_mirror(self):
         """Toggle horizontal mirror"""
-        self.video_thread.mirror = self.mirror_btn.isChecked()
+        thread = self.video_thread
+        thread.set_transform(self.mirror_btn.isChecked(), thread.flip, thread.rotate)
     
     def toggle_flip(self):
         """Toggle vertical flip"""
-        self.video_thread.flip = self.flip_btn.isChecked()
+        thread = self.video_thread
+        thread.set_transform(thread.mirror, self.flip_btn.isChecked(), thread.rotate)
     
     def rotate_video(self):
         """Rotate video by 90 degrees"""
-        self.video_thread.rotate = (self.video_thread.rotate + 90) % 360
+        thread = self.video_thread
+        thread.set_transform(thread.mirror, thread.flip, (thread.rotate + 90) % 360)
         rotation_text = f"↻ Rotate 90°"
         if self.video_thread.rotate != 0:
             rotation_text += f" ({self.video_thread.rotate}°)"
@@ -490,6 +868,13 @@ class WebcamController(QMainWindow):
         self.controls.clear()
         
         try:
+            if self._fd is not None:
+                for name, cid, min_val, max_val, current_val, default_val in query_controls(self._fd):
+                    self._control_ids[name] = cid
+                    self.create_slider_control(name, min_val, max_val, current_val, default_val)
+                self.controls_layout.addStretch()
+                return
+                
             result = subprocess.run(
                 ['v4l2-ctl', '-d', self.current_device, '--list-ctrls'],
                 capture_output=True,
@@ -514,16 +899,24 @@ class WebcamController(QMainWindow):
         lines = output.split('\n')
         
         for line in lines:
-            if not line.strip() or 'User Controls' in line or 'Camera Controls' in line:
+            # Control lines carry a hex id; skips headers and menu entries cheaply
+            if ' 0x' not in line or 'inactive' in line:
                 continue
                 
-            # Parse control line
-            match = re.match(r'\s*(\w+)\s+0x\w+\s+\((\w+)\)\s*:\s*min=(-?\d+)\s+max=(-?\d+).*default=(-?\d+)\s+value=(-?\d+)', line)
-            
+            # Parse boolean controls
+            if '(bool)' in line:
+                match = CTRL_BOOL_RE.match(line)
+                if match:
+                    name, default_val, current_val = match.groups()
+                    self.create_slider_control(name, 0, 1, int(current_val), int(default_val))
+                continue
+                
+            # Parse integer controls
+            match = CTRL_INT_RE.match(line)
             if match:
                 name, ctrl_type, min_val, max_val, default_val, current_val = match.groups()
                 
-                if ctrl_type == 'int' and 'inactive' not in line and 'flags=has-payload' not in line:
+                if ctrl_type == 'int' and 'flags=has-payload' not in line:
                     self.create_slider_control(
                         name, 
                         int(min_val), 
@@ -531,13 +924,6 @@ class WebcamController(QMainWindow):
                         int(current_val),
                         int(default_val)
                     )
-            
-            # Parse boolean controls
-            elif '(bool)' in line and 'inactive' not in line:
-                match = re.match(r'\s*(\w+)\s+0x\w+\s+\(bool\)\s*:\s*default=(\d+)\s+value=(\d+)', line)
-                if match:
-                    name, default_val, current_val = match.groups()
-                    self.create_slider_control(name, 0, 1, int(current_val), int(default_val))
         
         # Add stretch at the end
         self.controls_layout.addStretch()
@@ -641,7 +1027,28 @@ class WebcamController(QMainWindow):
             
         label.setText(f"{control_name.replace('_', ' ').title()}: {value}")
         
-        # Use subprocess for fastest execution
+        # Coalesce slider drags so only the latest value per control is written
+        self._pending_controls[control_name] = value
+        if not self._control_timer.isActive():
+            self._control_timer.start()
+    
+    def flush_controls(self):
+        """Write all pending control values to the device"""
+        pending = self._pending_controls
+        self._pending_controls = {}
+        for control_name, value in pending.items():
+            self.set_control(control_name, value)
+    
+    def set_control(self, control_name, value):
+        """Set a single v4l2 control"""
+        cid = self._control_ids.get(control_name)
+        if self._fd is not None and cid is not None:
+            try:
+                fcntl.ioctl(self._fd, VIDIOC_S_CTRL, v4l2_control(id=cid, value=value))
+            except OSError as e:
+                print(f"Error setting {control_name}: {e}")
+            return
+            
         try:
             subprocess.run(
                 ['v4l2-ctl', '-d', self.current_device, '--set-ctrl', f'{control_name}={value}'],
@@ -657,6 +1064,7 @@ class WebcamController(QMainWindow):
         """Handle application close"""
         if self.video_thread.running:
             self.video_thread.stop()
+        self.close_device()
         event.accept()
 
 
@@ -664,8 +1072,29 @@ def main():
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
+    # Put something on screen right away while OpenCV and Numba load
+    pixmap = QPixmap(360, 120)
+    pixmap.fill(QColor('#303030'))
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("Loading FluxCam...", Qt.AlignmentFlag.AlignCenter, QColor('#ffffff'))
+    splash.show()
+    app.processEvents()
+    
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(load_heavy_modules)
+        while not future.done():
+            app.processEvents()
+            wait([future], timeout=0.02)
+        future.result()
+    
+    # Let OpenCV's parallel backend use every core and the T-API where possible
+    cv2.setNumThreads(os.cpu_count() or 4)
+    cv2.ocl.setUseOpenCL(True)
+    print(f"OpenCV threads: {cv2.getNumThreads()}, OpenCL: {cv2.ocl.useOpenCL()}")
+    
     window = WebcamController()
     window.show()
+    splash.finish(window)
     sys.exit(app.exec())
 
 
@@ -0,0 +1,125 @@
+"""
+Numba kernels for the FluxCam effects
+Row-parallel uint8 pixel loops, imported lazily by Flux_Cam.load_heavy_modules
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+# Sepia colour matrix in Q8 fixed point, so the per-pixel math stays integer
+SEPIA_KERNEL = (np.array([[0.272, 0.534, 0.131],
+                          [0.349, 0.686, 0.168],
+                          [0.393, 0.769, 0.189]]) * 256).round().astype(np.int16)
+
+
+@njit(cache=True)
+def _reflect101(i, n):
+    """Mirror an out-of-range index like OpenCV's default border"""
+    if i < 0:
+        return -i
+    if i >= n:
+        return 2 * n - i - 2
+    return i
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def sepia_u8(src, dst):
+    """Apply the sepia colour matrix per pixel, saturating to uint8"""
+    h, w = src.shape[:2]
+    for y in prange(h):
+        for x in range(w):
+            b = np.int32(src[y, x, 0])
+            g = np.int32(src[y, x, 1])
+            r = np.int32(src[y, x, 2])
+            for c in range(3):
+                # 255 * 197 overflows int16, so accumulate in int32
+                acc = SEPIA_KERNEL[c, 0] * b + SEPIA_KERNEL[c, 1] * g + SEPIA_KERNEL[c, 2] * r
+                dst[y, x, c] = min((acc + 128) >> 8, 255)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def cartoon_u8(color, gray, ii, block, offset, dst):
+    """Adaptive mean threshold of gray fused with masking color, in one pass
+    
+    Equivalent to adaptiveThreshold(ADAPTIVE_THRESH_MEAN_C, THRESH_BINARY)
+    followed by bitwise_and, with each block mean read from the integral
+    image ii in four loads. Windows are clipped at the image border.
+    """
+    h, w = gray.shape
+    r = block // 2
+    for y in prange(h):
+        y0 = max(y - r, 0)
+        y1 = min(y + r + 1, h)
+        for x in range(w):
+            x0 = max(x - r, 0)
+            x1 = min(x + r + 1, w)
+            count = (y1 - y0) * (x1 - x0)
+            total = ii[y1, x1] - ii[y0, x1] - ii[y1, x0] + ii[y0, x0]
+            mean = (total + count // 2) // count
+            keep = np.int32(gray[y, x]) > mean - offset
+            for c in range(3):
+                dst[y, x, c] = color[y, x, c] if keep else 0
+
+
+@njit(cache=True)
+def _emboss_px(src, ym, y, yp, xm, x, xp, c):
+    """Emboss taps [[0, -1, -1], [1, 0, -1], [1, 1, 0]] plus the 128 bias"""
+    acc = (128 - np.int32(src[ym, x, c]) - np.int32(src[ym, xp, c])
+           + np.int32(src[y, xm, c]) - np.int32(src[y, xp, c])
+           + np.int32(src[yp, xm, c]) + np.int32(src[yp, x, c]))
+    return min(max(acc, 0), 255)
+
+
+@njit(cache=True)
+def _sharpen_px(src, ym, y, yp, xm, x, xp, c):
+    """Sharpen taps [[0, -1, 0], [-1, 5, -1], [0, -1, 0]]"""
+    acc = (5 * np.int32(src[y, x, c])
+           - np.int32(src[ym, x, c]) - np.int32(src[yp, x, c])
+           - np.int32(src[y, xm, c]) - np.int32(src[y, xp, c]))
+    return min(max(acc, 0), 255)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def emboss_u8(src, dst):
+    """Emboss filter with the +128 bias fused in, saturated to uint8"""
+    h, w = src.shape[:2]
+    for y in prange(h):
+        ym = _reflect101(y - 1, h)
+        yp = _reflect101(y + 1, h)
+        # Interior columns need no border handling, so this loop vectorizes
+        for x in range(1, w - 1):
+            for c in range(3):
+                dst[y, x, c] = _emboss_px(src, ym, y, yp, x - 1, x, x + 1, c)
+        for x in (0, w - 1):
+            xm = _reflect101(x - 1, w)
+            xp = _reflect101(x + 1, w)
+            for c in range(3):
+                dst[y, x, c] = _emboss_px(src, ym, y, yp, xm, x, xp, c)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def sharpen_u8(src, dst):
+    """Sharpen filter, saturated to uint8"""
+    h, w = src.shape[:2]
+    for y in prange(h):
+        ym = _reflect101(y - 1, h)
+        yp = _reflect101(y + 1, h)
+        for x in range(1, w - 1):
+            for c in range(3):
+                dst[y, x, c] = _sharpen_px(src, ym, y, yp, x - 1, x, x + 1, c)
+        for x in (0, w - 1):
+            xm = _reflect101(x - 1, w)
+            xp = _reflect101(x + 1, w)
+            for c in range(3):
+                dst[y, x, c] = _sharpen_px(src, ym, y, yp, xm, x, xp, c)
+
+
+def warmup():
+    """Compile every kernel on a dummy frame so the first real frame isn't stalled"""
+    dummy = np.zeros((8, 8, 3), np.uint8)
+    for kernel in (sepia_u8, emboss_u8, sharpen_u8):
+        kernel(dummy, np.empty_like(dummy))
+    gray = np.zeros((8, 8), np.uint8)
+    ii = np.zeros((9, 9), np.int32)
+    cartoon_u8(dummy, gray, ii, 9, 9, np.empty_like(dummy))